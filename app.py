@@ -6,11 +6,89 @@ Students need to implement the API endpoints as specified in the assignment.
 """
 
 from flask import Flask, request, jsonify, render_template
+from flask_compress import Compress
 from starter_preprocess import TextPreprocessor
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from urllib.parse import urlsplit
+import atexit
+import diskcache
+import hashlib
+import multiprocessing
+import orjson
+import os
 import traceback  # Good for debugging
 
 app = Flask(__name__)
-preprocessor = TextPreprocessor()
+
+# Compress JSON responses (a cleaned book is 1-3 MB of text); clients that
+# accept Brotli get it, everyone else gets gzip
+app.config['COMPRESS_MIMETYPES'] = ['application/json']
+app.config['COMPRESS_ALGORITHM'] = ['br', 'gzip']
+app.config['COMPRESS_LEVEL'] = 5
+app.config['COMPRESS_BR_LEVEL'] = 5
+app.config['COMPRESS_MIN_SIZE'] = 1024
+Compress(app)
+
+_preprocessor = None
+
+
+def get_preprocessor() -> TextPreprocessor:
+    """
+    Return this process's TextPreprocessor, creating it on first use so
+    every gunicorn worker builds its own after forking (NLTK state is
+    not fork-safe in every version).
+    """
+    global _preprocessor
+    if _preprocessor is None:
+        _preprocessor = TextPreprocessor()
+    return _preprocessor
+
+
+# Books in a batch are cleaned in separate processes, since the
+# regex/Counter work is CPU-bound and threads would share one GIL.
+# One per core by default; under gunicorn every worker has its own pool,
+# so gunicorn.conf.py sets BATCH_WORKERS to keep the total near the core count
+BATCH_WORKERS = int(os.environ.get('BATCH_WORKERS', os.cpu_count() or 1))
+_process_pool = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Return this process's pool for batch work, starting it on first use.
+    Pool processes are never forked from the (multithreaded) server
+    process: they come from a fork server, or are spawned where that
+    isn't available.
+    """
+    global _process_pool
+    if _process_pool is None:
+        start_method = ('forkserver' if 'forkserver' in multiprocessing.get_all_start_methods()
+                        else 'spawn')
+        _process_pool = ProcessPoolExecutor(
+            max_workers=BATCH_WORKERS,
+            mp_context=multiprocessing.get_context(start_method)
+        )
+    return _process_pool
+
+
+def shutdown_process_pool(wait: bool = True) -> None:
+    """Stop this process's batch pool, if any; the next batch starts a new one"""
+    global _process_pool
+    if _process_pool is not None:
+        _process_pool.shutdown(wait=wait, cancel_futures=True)
+        _process_pool = None
+
+
+atexit.register(shutdown_process_pool)
+
+# Upper bound on how many downloads one /api/clean_batch request can start
+MAX_BATCH_URLS = 50
+
+# Gutenberg texts never change, so finished /api/clean responses are cached
+# on disk (keyed by URL) and survive server restarts
+RESPONSE_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache')
+RESPONSE_CACHE_EXPIRE = 24 * 60 * 60  # seconds
+_response_cache = diskcache.Cache(RESPONSE_CACHE_DIR)
 
 
 @app.route('/')
@@ -43,30 +121,19 @@ def clean_text():
         if not url:
             return jsonify({"success": False, "error": "No 'url' key found in JSON payload."}), 400
 
+        # 0. Serve straight from the cache if this book was processed before
+        key = cache_key(url)
+        result = _response_cache.get(key)
+        if result is not None:
+            return json_response(result, 200)
+
         # 1. Fetch
-        raw_text = preprocessor.fetch_from_url(url) 
-        
-        # 2. Clean Gutenberg headers/footers
-        cleaned_text = preprocessor.clean_gutenberg_text(raw_text)
+        raw_text = get_preprocessor().fetch_bytes_from_url(url) 
         
-        # --- THIS IS THE NEW LOGIC ---
-        
-        # 3. Get stats from the CLEANED text (this method now does its own normalization)
-        statistics = preprocessor.get_text_statistics(cleaned_text)
-        
-        # 4. Create summary from the CLEANED text (which has punctuation)
-        summary = preprocessor.create_summary(cleaned_text)
-        
-        # 5. Normalize text *only* for the final output
-        normalized_text = preprocessor.normalize_text(cleaned_text)
-
-        # 6. Return the successful JSON response
-        return jsonify({
-            "success": True,
-            "cleaned_text": normalized_text, # Return the final processed text
-            "statistics": statistics,
-            "summary": summary
-        }), 200
+        # 2-6. Clean, analyze and return the successful JSON response
+        result = process_raw_text(raw_text)
+        _response_cache.set(key, result, expire=RESPONSE_CACHE_EXPIRE)
+        return json_response(result, 200)
         
     except Exception as e:
         print(traceback.format_exc()) 
@@ -75,6 +142,119 @@ def clean_text():
             "error": f"An error occurred: {str(e)}" 
         }), 400
 
+
+@app.route('/api/clean_batch', methods=['POST'])
+def clean_batch():
+    """
+    API endpoint that accepts a list of URLs, downloads them concurrently,
+    and returns one cleaned result per URL (in the same order).
+    """
+    try:
+        data = request.get_json()
+        if not data:
+            return jsonify({"success": False, "error": "No JSON payload provided."}), 400
+
+        urls = data.get('urls')
+        if not urls or not isinstance(urls, list):
+            return jsonify({"success": False, "error": "No 'urls' list found in JSON payload."}), 400
+        if len(urls) > MAX_BATCH_URLS:
+            return jsonify({"success": False, "error": f"At most {MAX_BATCH_URLS} URLs are allowed per batch."}), 400
+        if not all(isinstance(url, str) for url in urls):
+            return jsonify({"success": False, "error": "Every entry in 'urls' must be a string."}), 400
+
+        # 0. Look up every URL in the cache first; URLs that normalize to
+        # the same key are only looked up and fetched once
+        keys = [cache_key(url) for url in urls]
+        unique_urls = {}
+        for url, key in zip(urls, keys):
+            unique_urls.setdefault(key, url)
+        by_key = {key: _response_cache.get(key) for key in unique_urls}
+        missing = [key for key, result in by_key.items() if result is None]
+
+        # 1. Fetch the remaining URLs at once; each book is processed in the
+        # process pool as soon as its download finishes
+        # (failed downloads or processing come back as exceptions)
+        processed = get_preprocessor().fetch_many_from_urls(
+            [unique_urls[key] for key in missing],
+            process=process_raw_text,
+            executor=get_process_pool()
+        )
+        # A pool process that died (e.g. killed for running out of memory)
+        # breaks the whole pool, so replace it for the next batch
+        if any(isinstance(result, BrokenProcessPool) for result in processed):
+            shutdown_process_pool(wait=False)
+
+        for key, result in zip(missing, processed):
+            if isinstance(result, Exception):
+                by_key[key] = {
+                    "success": False,
+                    "error": f"An error occurred: {str(result)}"
+                }
+            else:
+                # 2. Remember each new result
+                by_key[key] = result
+                _response_cache.set(key, result, expire=RESPONSE_CACHE_EXPIRE)
+
+        results = [{"url": url, **by_key[key]} for url, key in zip(urls, keys)]
+
+        return json_response({
+            "success": True,
+            "results": results
+        }, 200)
+
+    except Exception as e:
+        print(traceback.format_exc())
+        return jsonify({
+            "success": False,
+            "error": f"An error occurred: {str(e)}"
+        }), 400
+
+
+def json_response(payload: dict, status: int = 200):
+    """
+    Build a JSON response with orjson. The /api/clean payloads carry a
+    whole book of text, which orjson encodes several times faster than
+    jsonify, straight to UTF-8 bytes.
+    """
+    return app.response_class(
+        orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS),
+        status=status,
+        mimetype='application/json'
+    )
+
+
+def cache_key(url: str) -> str:
+    """
+    Hash a URL for the response cache. http/https, host casing and a
+    trailing slash don't change which book is served, so they are
+    normalized away first.
+    """
+    parts = urlsplit(url.strip())
+    normalized = f"https://{parts.netloc.lower()}{parts.path.rstrip('/')}"
+    if parts.query:
+        normalized += f"?{parts.query}"
+    return hashlib.blake2b(normalized.encode('utf-8')).hexdigest()
+
+
+def process_raw_text(raw_text: bytes) -> dict:
+    """Run the clean/statistics/summary pipeline on a downloaded book"""
+    preprocessor = get_preprocessor()
+
+    # 2. Clean Gutenberg headers/footers
+    cleaned_text = preprocessor.clean_gutenberg_text(raw_text)
+
+    # 3-5. Stats and summary from the CLEANED text (which has punctuation),
+    # normalized text *only* for the final output
+    normalized_text, statistics, summary = preprocessor.compute_all(cleaned_text)
+
+    return {
+        "success": True,
+        "cleaned_text": normalized_text, # Return the final processed text
+        "statistics": statistics,
+        "summary": summary
+    }
+
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze_text():
     """
@@ -90,7 +270,7 @@ def analyze_text():
             return jsonify({"success": False, "error": "No 'text' key found in JSON payload."}), 400
 
         # Run stats directly on the raw text
-        statistics = preprocessor.get_text_statistics(text)
+        statistics = get_preprocessor().get_text_statistics(text)
         
         return jsonify({
             "success": True,
@@ -131,10 +311,16 @@ if __name__ == '__main__':
     print("   GET  /           - Web interface")
     print("   GET  /health     - Health check")
     print("   POST /api/clean  - Clean text from URL")
+    print("   POST /api/clean_batch - Clean text from several URLs")
     print("   POST /api/analyze - Analyze raw text")
     print()
     print("🌐 Open your browser to: http://localhost:5000")
     print("⏹️  Press Ctrl+C to stop the server")
 
+    # Debug mode (auto-reload, tracebacks in the browser) only when asked for:
+    #   FLASK_ENV=development python app.py
+    # For real traffic use gunicorn instead: gunicorn -c gunicorn.conf.py wsgi:app
+    debug = os.environ.get('FLASK_ENV') == 'development'
+
     # host='0.0.0.0' makes it accessible within Codespaces
-    app.run(debug=True, port=5000, host='0.0.0.0')
+    app.run(debug=debug, port=5000, host='0.0.0.0')
@@ -0,0 +1,30 @@
+"""
+gunicorn.conf.py
+gunicorn settings for the text preprocessing service
+
+Usage: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+# host 0.0.0.0 makes it accessible within Codespaces
+bind = "0.0.0.0:5000"
+
+# Each worker starts its own process pool of BATCH_WORKERS processes for
+# /api/clean_batch (default 2, so one batch cleans two books at a time).
+# The cores are split between the two: there is one worker per
+# BATCH_WORKERS cores, which keeps workers x pool processes around the
+# core count. Set BATCH_WORKERS=1 to favour /api/clean throughput instead
+# (one worker per core, with batches cleaned one book at a time).
+batch_workers = max(1, int(os.environ.get("BATCH_WORKERS", 2)))
+raw_env = [f"BATCH_WORKERS={batch_workers}"]
+
+# CPU-heavy cleaning/statistics steps run in parallel across workers;
+# threads let each worker overlap slow Gutenberg downloads
+workers = max(1, multiprocessing.cpu_count() // batch_workers)
+worker_class = "gthread"
+threads = 4
+
+# Large books can take a while to download and process
+timeout = 60
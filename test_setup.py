@@ -6,74 +6,145 @@ Environment validation script for the warm-up assignment
 Run this to verify your environment is set up correctly before starting the assignment.
 """
 
+import os
+import re
 import sys
+import io
+import http.client
 import importlib
-import subprocess
-import platform
+import importlib.metadata
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from types import ModuleType
+from typing import Callable, FrozenSet, Iterator, List, Optional, TextIO, Tuple, cast
 
-def check_python_version():
-    """Check if Python version is 3.9+"""
-    version = sys.version_info
-    print(f"🐍 Python version: {version.major}.{version.minor}.{version.micro}")
+# A test returns whether it passed; runners yield (name, passed, output)
+TestFunc = Callable[[], bool]
+TestResult = Tuple[str, bool, str]
+
+# Codespaces advertises itself through environment variables, which are fixed
+# for the lifetime of the process
+_IN_CODESPACES = 'CODESPACES' in os.environ or 'CODESPACE_NAME' in os.environ
+
+# Paths probed on www.gutenberg.org over one keep-alive connection
+_GUTENBERG_PATHS = (
+    "/files/1342/1342-0.txt",
+)
+
+# Set OFFLINE=1 to skip the network check when there is no internet access
+_OFFLINE = os.environ.get("OFFLINE") == "1"
+
+_WORD_RE = re.compile(r"[A-Za-z]+")
+
+# The interpreter version cannot change while the script runs
+_PYVER = sys.version_info[:2]
+_PY_OK = _PYVER >= (3, 9)
+
+# Distribution names as pip knows them (bs4 is beautifulsoup4, dotenv is
+# python-dotenv and flask_compress is flask-compress), already in normalized
+# form; everything app.py and starter_preprocess.py import at startup
+_REQUIRED = frozenset({
+    'flask',
+    'flask-compress',
+    'requests',
+    'aiohttp',
+    'diskcache',
+    'numpy',
+    'orjson',
+    'beautifulsoup4',
+    'nltk',
+    'python-dotenv',
+})
+
+def _normalize_dist_name(name: str) -> str:
+    """Normalize a distribution name the way pip compares them"""
+    return re.sub(r"[-_.]+", "-", name).lower()
+
+# The package probe only depends on the running interpreter, so it is
+# memoized. The forked runner fills the cache in the parent before forking,
+# so calling main() again just reprints the cached results.
+@lru_cache(maxsize=1)
+def _missing_packages() -> FrozenSet[str]:
+    """Return the required distributions that are not installed"""
+    # One pass over the installed distributions' metadata instead of a
+    # separate module search per package
+    installed = {
+        _normalize_dist_name(dist.metadata['Name'])
+        for dist in importlib.metadata.distributions()
+        if dist.metadata['Name']
+    }
+    return _REQUIRED - installed
+
+@lru_cache(maxsize=None)
+def _lazy_import(name: str) -> ModuleType:
+    """Import a module the first time a test needs it, then reuse the reference
+    
+    The cache only outlives a test under the threaded runner; a forked test
+    imports into its own child process, which exits afterwards.
+    """
+    return importlib.import_module(name)
+
+def check_python_version() -> bool:
+    """Python Version
+    
+    Check if Python version is 3.9+
+    """
+    print(f"🐍 Python version: {_PYVER[0]}.{_PYVER[1]}.{sys.version_info.micro}")
     
-    if version.major == 3 and version.minor >= 9:
+    if _PY_OK:
         print("✅ Python version is compatible")
         return True
     else:
         print("❌ Python 3.9+ required")
         return False
 
-def check_required_packages():
-    """Check if all required packages are installed"""
-    required_packages = [
-        'flask',
-        'requests', 
-        'bs4',  # beautifulsoup4 imports as bs4
-        'nltk',
-        'dotenv'  # python-dotenv imports as dotenv
-    ]
+def check_required_packages() -> bool:
+    """Required Packages
     
+    Check if all required packages are installed
+    """
     print("\n📦 Checking required packages...")
-    all_installed = True
+    missing = _missing_packages()
     
-    for package in required_packages:
-        try:
-            importlib.import_module(package)
-            print(f"✅ {package}")
-        except ImportError:
-            print(f"❌ {package} - Run: pip install {package}")
-            all_installed = False
+    for package in sorted(_REQUIRED - missing):
+        print(f"✅ {package}")
     
-    return all_installed
+    if missing:
+        missing_names = " ".join(sorted(missing))
+        print(f"❌ Missing: {missing_names} - Run: pip install {missing_names}")
+    
+    return not missing
 
-def check_codespace_environment():
+def check_codespace_environment() -> bool:
     """Check if running in GitHub Codespaces"""
-    if 'CODESPACES' in sys.modules or 'CODESPACE_NAME' in sys.modules:
+    if _IN_CODESPACES:
         print("\n🚀 Running in GitHub Codespaces")
         return True
     else:
         print("\n💻 Running in local environment")
         return True  # Not an error, just informational
 
-def test_basic_functionality():
-    """Test basic functionality of key libraries"""
+def test_basic_functionality() -> bool:
+    """Basic Functionality
+    
+    Test basic functionality of key libraries
+    """
     print("\n🧪 Testing basic functionality...")
     
     try:
         # Test requests
-        import requests
+        _lazy_import('requests')
         print("✅ requests library working")
         
         # Test Flask
-        from flask import Flask
-        test_app = Flask(__name__)
+        test_app = _lazy_import('flask').Flask(__name__)
         print("✅ Flask can create app instance")
         
-        # Test text processing
-        import re
+        # Test text processing: count matches without building a word list
         text = "Hello, World! This is a test."
-        words = text.lower().split()
-        print(f"✅ Text processing working: {len(words)} words found")
+        word_count = sum(1 for _ in _WORD_RE.finditer(text))
+        print(f"✅ Text processing working: {word_count} words found")
         
         return True
         
@@ -81,73 +152,210 @@ def test_basic_functionality():
         print(f"❌ Functionality test failed: {e}")
         return False
 
-def test_project_gutenberg_access():
-    """Test if we can access Project Gutenberg URLs"""
+def test_project_gutenberg_access() -> bool:
+    """Project Gutenberg Access
+    
+    Test if we can access Project Gutenberg URLs
+    """
     print("\n📚 Testing Project Gutenberg access...")
     
+    if _OFFLINE:
+        print("⏭️  Skipped (OFFLINE=1)")
+        return True
+    
+    # Bare stdlib HEAD requests; pulling in requests here would only add import time.
+    # The connection is reused for every path, so TLS is negotiated only once.
+    conn = http.client.HTTPSConnection("www.gutenberg.org", timeout=10)
     try:
-        import requests
-        
-        # Test with a small file
-        test_url = "https://www.gutenberg.org/files/1342/1342-0.txt"
-        response = requests.head(test_url, timeout=10)
+        for path in _GUTENBERG_PATHS:
+            conn.request("HEAD", path)
+            response = conn.getresponse()
+            response.read()  # Drain so the connection can take the next request
+            
+            if response.status != 200:
+                print(f"⚠️  Project Gutenberg returned status {response.status}")
+                return False
         
-        if response.status_code == 200:
-            print("✅ Project Gutenberg accessible")
-            return True
-        else:
-            print(f"⚠️  Project Gutenberg returned status {response.status_code}")
-            return False
+        print("✅ Project Gutenberg accessible")
+        return True
             
-    except Exception as e:
+    except (OSError, http.client.HTTPException) as e:
         print(f"⚠️  Could not reach Project Gutenberg: {e}")
         print("   This might be a temporary network issue")
         return False
+    finally:
+        conn.close()
+
+class _ThreadRoutedStdout:
+    """Send print() output to the current thread's buffer, if it has one
+    
+    A plain class rather than an io.TextIOBase subclass, which mypyc could
+    not compile; print() only needs write() and flush().
+    """
+
+    def __init__(self, stream: TextIO) -> None:
+        self._stream = stream
+        self._local = threading.local()
 
-def main():
+    def write(self, text: str) -> int:
+        buffer: Optional[io.StringIO] = getattr(self._local, 'buffer', None)
+        if buffer is None:
+            return self._stream.write(text)
+        return buffer.write(text)
+
+    def flush(self) -> None:
+        self._stream.flush()
+
+    def run_captured(self, test_func: TestFunc) -> Tuple[bool, str]:
+        """Run test_func, returning (result, everything it printed)"""
+        self._local.buffer = io.StringIO()
+        try:
+            return test_func(), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
+def _run_tests_threaded(tests: List[Tuple[str, TestFunc]]) -> Iterator[TestResult]:
+    """Run tests on a thread pool, yielding (name, result, output) in order"""
+    original_stdout = sys.stdout
+    routed_stdout = _ThreadRoutedStdout(original_stdout)
+    sys.stdout = cast(TextIO, routed_stdout)
+    try:
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            futures = [(test_name, executor.submit(routed_stdout.run_captured, test_func))
+                       for test_name, test_func in tests]
+            for test_name, future in futures:
+                result, output = future.result()
+                yield test_name, result, output
+    finally:
+        sys.stdout = original_stdout
+
+def _run_tests_forked(tests: List[Tuple[str, TestFunc]]) -> Iterator[TestResult]:
+    """Run each test in a forked child, yielding (name, result, output) in order
+    
+    The child sends its printed output back over a pipe and reports the
+    result through its exit status (POSIX only).
+    """
+    # Fill the package probe's cache here so every child inherits it and
+    # repeat main() calls reuse it (it imports no third-party modules)
+    _missing_packages()
+    
+    sys.stdout.flush()
+    children = []
+    for test_name, test_func in tests:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            buf = io.StringIO()
+            sys.stdout = buf
+            exit_code = 1
+            try:
+                exit_code = 0 if test_func() else 1
+            finally:
+                with os.fdopen(write_fd, 'wb') as pipe:
+                    pipe.write(buf.getvalue().encode())
+                os._exit(exit_code)
+        os.close(write_fd)
+        children.append((test_name, pid, read_fd))
+    
+    for test_name, pid, read_fd in children:
+        with os.fdopen(read_fd, 'rb') as pipe:
+            output = pipe.read().decode()
+        _, wait_status = os.waitpid(pid, 0)
+        # Not os.waitstatus_to_exitcode: that needs Python 3.9, and this script
+        # must still run far enough on older versions to report them
+        passed = os.WIFEXITED(wait_status) and os.WEXITSTATUS(wait_status) == 0
+        yield test_name, passed, output
+
+# Summary row labels, padded once so rows line up
+_PASS = f"{'✅ PASS':<8}"
+_FAIL = f"{'❌ FAIL':<8}"
+
+_SETUP_COMPLETE_MESSAGE = """\
+🎉 ENVIRONMENT SETUP COMPLETE!
+You're ready to start the warm-up assignment!
+
+Next steps:
+1. Read the assignment PDF carefully
+2. Start with Part 2: Extending the TextPreprocessor
+3. Test each part incrementally
+"""
+
+_SETUP_INCOMPLETE_MESSAGE = """\
+⚠️  SETUP INCOMPLETE
+Please fix the failed tests before starting the assignment.
+
+Tip: Run 'pip install -r requirements.txt' to install missing packages
+"""
+
+def _display_name(test_func: TestFunc) -> str:
+    """First docstring line of a test, e.g. "Python Version"
+    
+    mypyc-compiled functions have no docstrings, so fall back to the
+    function name without its check_/test_ prefix, in title case.
+    """
+    if test_func.__doc__:
+        return test_func.__doc__.split('\n', 1)[0]
+    name = test_func.__name__
+    for prefix in ('check_', 'test_'):
+        if name.startswith(prefix):
+            name = name[len(prefix):]
+    return name.replace('_', ' ').title()
+
+# Tests run by main(), in report order; each one's display name is the
+# first line of its docstring
+_TESTS: Tuple[TestFunc, ...] = (
+    check_python_version,
+    check_required_packages,
+    test_basic_functionality,
+    test_project_gutenberg_access,
+)
+
+def main() -> bool:
     """Run all setup tests"""
-    print("🔍 CSE 510 Warm-Up Assignment - Environment Setup Test")
-    print("=" * 60)
+    # Shown straight away so there is feedback while the checks run
+    sys.stdout.write("🔍 CSE 510 Warm-Up Assignment - Environment Setup Test\n" + "=" * 60 + "\n")
+    sys.stdout.flush()
+    
+    tests = [(_display_name(test_func), test_func) for test_func in _TESTS]
     
-    tests = [
-        ("Python Version", check_python_version),
-        ("Required Packages", check_required_packages), 
-        ("Basic Functionality", test_basic_functionality),
-        ("Project Gutenberg Access", test_project_gutenberg_access)
-    ]
+    # The tests are independent and mostly wait on imports or the network,
+    # so run them concurrently and print each one's buffered output in order.
+    # Forked children also keep each test's imports out of this process.
+    # The network check is launched first so its round trip overlaps the
+    # local checks instead of starting after them.
+    run_tests = _run_tests_forked if hasattr(os, 'fork') else _run_tests_threaded
+    launch_order = sorted(tests, key=lambda test: test[1] is not test_project_gutenberg_access)
+    finished = {test_name: (result, output)
+                for test_name, result, output in run_tests(launch_order)}
     
+    # The rest of the report is assembled in memory and written in one go
+    report = io.StringIO()
     results = []
-    for test_name, test_func in tests:
-        print(f"\n--- {test_name} ---")
-        result = test_func()
+    for test_name, _ in tests:
+        result, output = finished[test_name]
+        report.write(f"\n--- {test_name} ---\n")
+        report.write(output)
         results.append((test_name, result))
     
     # Summary
-    print("\n" + "=" * 60)
-    print("📋 SETUP TEST SUMMARY")
-    print("=" * 60)
-    
-    all_passed = True
-    for test_name, passed in results:
-        status = "✅ PASS" if passed else "❌ FAIL"
-        print(f"{status:<8} {test_name}")
-        if not passed:
-            all_passed = False
-    
-    print("\n" + "=" * 60)
+    report.write("\n" + "=" * 60 + "\n")
+    report.write("📋 SETUP TEST SUMMARY\n")
+    report.write("=" * 60 + "\n")
+    
+    rows = [f"{_PASS if passed else _FAIL} {test_name}"
+            for test_name, passed in results]
+    report.write("\n".join(rows) + "\n")
+    all_passed = all(passed for _, passed in results)
+    
+    report.write("\n" + "=" * 60 + "\n")
     if all_passed:
-        print("🎉 ENVIRONMENT SETUP COMPLETE!")
-        print("You're ready to start the warm-up assignment!")
-        print("\nNext steps:")
-        print("1. Read the assignment PDF carefully")
-        print("2. Start with Part 2: Extending the TextPreprocessor")
-        print("3. Test each part incrementally")
+        report.write(_SETUP_COMPLETE_MESSAGE)
     else:
-        print("⚠️  SETUP INCOMPLETE")
-        print("Please fix the failed tests before starting the assignment.")
-        print("\nTip: Run 'pip install -r requirements.txt' to install missing packages")
+        report.write(_SETUP_INCOMPLETE_MESSAGE)
     
-    print("=" * 60)
+    report.write("=" * 60 + "\n")
+    sys.stdout.write(report.getvalue())
     
     return all_passed
 
@@ -0,0 +1,11 @@
+"""
+wsgi.py
+WSGI entrypoint for running the app under a production server:
+
+    gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from app import app
+
+if __name__ == '__main__':
+    app.run(port=5000, host='0.0.0.0')